@@ -0,0 +1,75 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from convert_pct_mip_tga import (
+    ASSET_PCT_DIR,
+    read_resource_yaml, mip_dims, expected_mip_size,
+    find_resource, collect_mips, int_flag,
+)
+
+# ------------- Checks (runs in workers) -------------
+def audit_one(mip_path):
+    """Problems with one _1.pct_mip, found from its stat and resource header only."""
+    res_path = find_resource(mip_path)
+    if res_path is None:
+        return mip_path, ["no .pct.resource found"]
+    try:
+        file_size = os.stat(mip_path).st_size
+        header = (read_resource_yaml(res_path) or {}).get("header", {})
+    except Exception as e:
+        return mip_path, [f"unreadable: {e!r}"]
+
+    fmt = header.get("format")
+    sx, sy = header.get("sx"), header.get("sy")
+    if not sx or not sy:
+        return mip_path, [f"bad dimensions sx={sx} sy={sy}"]
+    levels = mip_dims(header)
+    if not levels:
+        return mip_path, ["no mip levels in resource"]
+
+    problems = []
+    top = levels[0][0]
+    for i, m, w, h in levels:
+        off, size = m.get("offset"), m.get("size")
+        if not isinstance(off, int) or not isinstance(size, int) or off < 0 or size <= 0:
+            problems.append(f"mip {i} ({w}x{h}): bad entry offset={off} size={size}")
+            continue
+        if off + size > file_size:
+            problems.append(f"mip {i} ({w}x{h}): offset+size={off + size} past end of file ({file_size})")
+        want = expected_mip_size(fmt, w, h)
+        if want is None and i == top:
+            # convert_one's fallback: unknown formats work as raw RGBA
+            want = sx * sy * 4
+        if want is not None and size != want:
+            kind = "short" if size < want else "oversized"
+            problems.append(f"mip {i} ({w}x{h}): {kind}, size={size} expected {want}")
+    return mip_path, problems
+
+def main():
+    jobs = os.cpu_count() or 1
+    paths = []
+    for a in sys.argv[1:]:
+        if a.startswith("-jobs="):
+            jobs = int_flag(a, "a whole number of workers, e.g. -jobs=4")
+        else:
+            paths.append(a)
+
+    mips = collect_mips(paths or [ASSET_PCT_DIR], recursive=True)
+    if not mips:
+        print(f"No _1.pct_mip files found in {', '.join(paths or [ASSET_PCT_DIR])}")
+        sys.exit(1)
+
+    bad = 0
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for mip_path, problems in pool.map(audit_one, mips, chunksize=64):
+            if problems:
+                bad += 1
+                print(mip_path)
+                for p in problems:
+                    print(f"  {p}")
+    print(f"Audited {len(mips)} texture(s): {bad} with problems")
+    sys.exit(1 if bad else 0)
+
+if __name__ == "__main__":
+    main()
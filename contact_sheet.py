@@ -0,0 +1,159 @@
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from PIL import Image, ImageDraw
+
+from convert_pct_mip_tga import (
+    SCRIPT_DIR, FORMAT_MAP,
+    ensure_texconv, read_resource_yaml, make_dds_header, mip_dims,
+    find_resource, collect_mips, int_flag,
+    bc4_to_img, bc5_raw_to_rgb, texconv_to_bmp,
+)
+
+# ---------------- Paths ----------------
+SHEET_OUT_DIR = os.path.join(SCRIPT_DIR, "project", "resources", "contact_sheets")
+
+# ---------------- Layout ----------------
+THUMB = 256       # longest side of each thumbnail
+COLS = 8
+ROWS = 6
+LABEL_H = 16
+PAD = 4
+BG = (32, 32, 32)
+
+# ------------- Mip selection -------------
+def pick_small_mip(header, thumb):
+    """Smallest level that is still at least thumb on its longest side."""
+    levels = mip_dims(header)
+    if not levels:
+        return None
+    for _, m, w, h in reversed(levels):
+        if max(w, h) >= thumb:
+            return m, w, h
+    return levels[0][1:]
+
+# ------------- Decode (runs in workers) -------------
+def decode_small(mip_path, thumb=THUMB, debug=False):
+    name = os.path.basename(mip_path)[:-len("_1.pct_mip")]
+    res_path = find_resource(mip_path)
+    if res_path is None:
+        if debug: print(f"[DEBUG] Resource not found for {mip_path}")
+        return name, None
+    try:
+        header = (read_resource_yaml(res_path) or {}).get("header", {})
+        fmt = header.get("format")
+        picked = pick_small_mip(header, thumb)
+        if picked is None:
+            return name, None
+        m, w, h = picked
+        with open(mip_path, "rb") as f:
+            f.seek(m["offset"])
+            raw = f.read(m["size"])
+
+        if fmt == 37:
+            img = Image.fromarray(bc4_to_img(raw, w, h), mode="L").convert("RGB")
+        elif fmt == 36:
+            img = Image.fromarray(bc5_raw_to_rgb(raw, w, h), mode="RGB")
+        elif fmt in FORMAT_MAP:
+            typ, fourcc, dxgi = FORMAT_MAP[fmt]
+            with tempfile.TemporaryDirectory() as tmp:
+                dds_path = os.path.join(tmp, f"{name}.dds")
+                with open(dds_path, "wb") as out:
+                    out.write(make_dds_header(w, h, typ, fourcc, dxgi))
+                    out.write(raw)
+                if texconv_to_bmp(dds_path, tmp, debug=debug).returncode != 0:
+                    return name, None
+                with Image.open(os.path.join(tmp, f"{name}.bmp")) as bmp:
+                    img = bmp.convert("RGB")
+        elif len(raw) == w * h * 4:
+            arr = np.frombuffer(raw, dtype=np.uint8).reshape((h, w, 4))[:, :, :3]
+            img = Image.fromarray(arr, mode="RGB")
+        else:
+            if debug: print(f"[DEBUG] Format {fmt} not supported for {mip_path}")
+            return name, None
+
+        img.thumbnail((thumb, thumb))
+        return name, img
+    except Exception as e:
+        if debug:
+            print(f"[DEBUG] {mip_path}:", repr(e))
+        return name, None
+
+# ------------- Sheet packing -------------
+def build_page(thumbs, thumb=THUMB, cols=COLS):
+    """One sheet from up to cols*rows (name, image) pairs."""
+    cell_w, cell_h = thumb + PAD, thumb + LABEL_H + PAD
+    used_rows = (len(thumbs) + cols - 1) // cols
+    page = Image.new("RGB", (cols * cell_w + PAD, used_rows * cell_h + PAD), BG)
+    draw = ImageDraw.Draw(page)
+    for i, (name, img) in enumerate(thumbs):
+        x = PAD + (i % cols) * cell_w
+        y = PAD + (i // cols) * cell_h
+        if img is None:
+            draw.rectangle([x, y, x + thumb - 1, y + thumb - 1], outline=(160, 0, 0))
+            draw.text((x + 4, y + 4), "failed", fill=(200, 60, 60))
+        else:
+            page.paste(img, (x + (thumb - img.width) // 2, y + (thumb - img.height) // 2))
+        draw_label(draw, (x, y + thumb + 2), name, thumb // 6)
+    return page
+
+def draw_label(draw, xy, name, max_chars):
+    # ASCII "..." since Pillow's default bitmap font (< 10.1) is latin-1 only
+    label = name if len(name) <= max_chars else name[:max(1, max_chars - 3)] + "..."
+    try:
+        draw.text(xy, label, fill=(220, 220, 220))
+    except Exception:
+        # names the font can't encode shouldn't take the whole sheet down
+        safe = label.encode("ascii", "replace").decode("ascii")
+        try:
+            draw.text(xy, safe, fill=(220, 220, 220))
+        except Exception:
+            pass
+
+def main():
+    debug = False
+    thumb, cols, rows = THUMB, COLS, ROWS
+    jobs = os.cpu_count() or 1
+    paths = []
+    for a in sys.argv[1:]:
+        if a == "-debug":
+            debug = True
+        elif a.startswith("-size="):
+            thumb = int_flag(a, "a thumbnail size of 16 pixels or more, e.g. -size=256", minimum=16)
+        elif a.startswith("-cols="):
+            cols = int_flag(a, "a whole number of columns, e.g. -cols=8")
+        elif a.startswith("-rows="):
+            rows = int_flag(a, "a whole number of rows, e.g. -rows=6")
+        elif a.startswith("-jobs="):
+            jobs = int_flag(a, "a whole number of workers, e.g. -jobs=4")
+        else:
+            paths.append(a)
+
+    mips = collect_mips(paths)
+    if not mips:
+        print("Drag a folder of _1.pct_mip files (or the files themselves) onto this script.")
+        sys.exit(1)
+
+    ensure_texconv(debug)  # once, before workers race to download it
+    os.makedirs(SHEET_OUT_DIR, exist_ok=True)
+    label = os.path.basename(os.path.normpath(paths[0])) if len(paths) == 1 else "sheet"
+    label = label.replace("_1.pct_mip", "")
+    per_page = cols * rows
+    failed = 0
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        # decode one page worth at a time so only a single page of
+        # thumbnails is ever held in memory
+        for i, start in enumerate(range(0, len(mips), per_page), 1):
+            chunk = mips[start:start + per_page]
+            thumbs = list(pool.map(decode_small, chunk, [thumb] * len(chunk), [debug] * len(chunk)))
+            failed += sum(1 for _, img in thumbs if img is None)
+            out = os.path.join(SHEET_OUT_DIR, f"{label}_{i:03d}.png")
+            build_page(thumbs, thumb, cols).save(out)
+            print(f"Saved: {out}")
+    if failed:
+        print(f"{failed} of {len(mips)} texture(s) could not be decoded")
+
+if __name__ == "__main__":
+    main()
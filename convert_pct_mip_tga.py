@@ -3,7 +3,11 @@ import sys
 import json
 import yaml
 import urllib.request
+import shutil
 import subprocess
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
 import numpy as np
 from PIL import Image
 
@@ -12,7 +16,14 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 BIN_DIR = os.path.join(SCRIPT_DIR, "project", "bin")
 ASSET_PCT_DIR = os.path.join(SCRIPT_DIR, "project", "assets", "pct")
 TGA_OUT_DIR = os.path.join(SCRIPT_DIR, "project", "resources", "tga")
+DDS_OUT_DIR = os.path.join(SCRIPT_DIR, "project", "resources", "dds")
 TEXCONV_EXE = os.path.join(BIN_DIR, "texconv.exe")
+JOURNAL_PATH = os.path.join(TGA_OUT_DIR, "convert_journal.log")
+WORK_PREFIX = ".work-"  # per-job intermediate dirs inside TGA_OUT_DIR
+
+# ------------- Scheduler defaults -------------
+DEFAULT_MEM_BUDGET_GB = 12        # leaves headroom on a 16 GB machine
+WORKER_OVERHEAD = 96 * 1024 * 1024  # interpreter + numpy/PIL per worker process
 
 # -------------- Format Map --------------
 # 34: BC1/DXT1, 35: BC2/DXT3, 36: BC5/ATI2 (normals/spec),
@@ -27,6 +38,15 @@ FORMAT_MAP = {
     52: ("DX10",   b"DX10", 99),        # DXGI_FORMAT_BC7_UNORM_SRGB
 }
 
+# bytes per 4x4 block, as the decoders / texconv consume them
+BLOCK_BYTES = {34: 8, 35: 16, 36: 16, 37: 8, 51: 16, 52: 16}
+
+# DDS export writes the payload untouched, so 37 has to be labelled as the
+# one-channel BC4 it really is rather than the DXT5 texconv workaround above
+DDS_FORMAT_MAP = {**FORMAT_MAP, 37: ("FOURCC", b"ATI1", None)}
+
+COPY_CHUNK = 1 << 20  # fallback read/write chunk for mip payload copies
+
 # ------------- Helpers: I/O -------------
 def fetch_latest_texconv_exe_url():
     with urllib.request.urlopen("https://api.github.com/repos/microsoft/DirectXTex/releases") as resp:
@@ -46,12 +66,72 @@ def ensure_texconv(debug=False):
         print("[DEBUG] Downloading texconv.exe …")
     urllib.request.urlretrieve(url, TEXCONV_EXE)
 
+def int_flag(arg, expected, minimum=1):
+    """Value of a -name=N flag; prints what was expected and exits if bad."""
+    try:
+        value = int(arg.split("=", 1)[1])
+    except ValueError:
+        value = None
+    if value is None or value < minimum:
+        print(f"Bad {arg!r}: expected {expected}")
+        sys.exit(1)
+    return value
+
 def read_resource_yaml(resource_path):
     with open(resource_path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+        # libyaml's loader when available; big batches spend most time here
+        return yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+def find_resource(mip_path):
+    """The .pct.resource for a _1.pct_mip, or None. Every tool goes through
+    this so the audit checks the same file the converter will read."""
+    name = os.path.basename(mip_path)[:-len("_1.pct_mip")]
+    # next to the mip first, then the usual assets folder
+    for d in (os.path.dirname(mip_path), ASSET_PCT_DIR):
+        p = os.path.join(d, f"{name}.pct.resource")
+        if os.path.isfile(p):
+            return p
+    return None
+
+def collect_mips(paths, recursive=False):
+    """_1.pct_mip files from a mix of files and folders, sorted by name."""
+    out = []
+    stack = []
+    for p in paths:
+        if os.path.isdir(p):
+            stack.append(p)
+        elif p.endswith("_1.pct_mip"):
+            out.append(p)
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for e in it:
+                if recursive and e.is_dir():
+                    stack.append(e.path)
+                elif e.is_file() and e.name.endswith("_1.pct_mip"):
+                    out.append(e.path)
+    return sorted(out, key=lambda p: os.path.basename(p).lower())
+
+# ------------- Helpers: mip levels -------------
+def mip_dims(header):
+    """(index, mip, width, height) for every level, largest first.
+
+    index is the entry's position in header.mipLevel. Levels without explicit
+    width/height are taken to halve from sx/sy in list order; the byte size
+    is never used, so a truncated entry can't reorder the chain."""
+    sx, sy = header.get("sx") or 1, header.get("sy") or 1
+    levels = [(i, m, m.get("width", max(1, sx >> i)), m.get("height", max(1, sy >> i)))
+              for i, m in enumerate(header.get("mipLevel") or [])]
+    return sorted(levels, key=lambda l: (-l[2] * l[3], l[0]))
+
+def expected_mip_size(fmt, width, height):
+    """Byte size of one block-compressed level, or None for unknown formats."""
+    block = BLOCK_BYTES.get(fmt)
+    if block is None:
+        return None
+    return max(1, (width+3)//4) * max(1, (height+3)//4) * block
 
 # -------- DDS Header for compressed data --------
-def make_dds_header(width, height, header_type, fourcc, dxgi_fmt=None):
+def make_dds_header(width, height, header_type, fourcc, dxgi_fmt=None, mip_count=1, block_bytes=16):
     hdr = bytearray(128 + (20 if header_type == "DX10" else 0))
     # DDS magic + header size/flags
     hdr[0:4] = b"DDS "
@@ -59,10 +139,10 @@ def make_dds_header(width, height, header_type, fourcc, dxgi_fmt=None):
     hdr[8:12] = (0x00021007).to_bytes(4, "little")  # CAPS|HEIGHT|WIDTH|PIXELFORMAT|LINEARSIZE
     hdr[12:16] = height.to_bytes(4, "little")
     hdr[16:20] = width.to_bytes(4, "little")
-    lin = max(1, (width+3)//4) * max(1, (height+3)//4) * 16
+    lin = max(1, (width+3)//4) * max(1, (height+3)//4) * block_bytes
     hdr[20:24] = lin.to_bytes(4, "little")
     hdr[24:28] = (0).to_bytes(4, "little")          # depth
-    hdr[28:32] = (1).to_bytes(4, "little")          # mipMapCount=1
+    hdr[28:32] = mip_count.to_bytes(4, "little")    # mipMapCount
     hdr[32:76] = (0).to_bytes(44, "little")         # reserved
     # PIXELFORMAT (FOURCC)
     hdr[76:80] = (32).to_bytes(4, "little")
@@ -71,10 +151,10 @@ def make_dds_header(width, height, header_type, fourcc, dxgi_fmt=None):
     hdr[88:92] = (0).to_bytes(4, "little")
     hdr[92:108] = (0).to_bytes(16, "little")
     # CAPS
-    hdr[108:112] = (0x1000).to_bytes(4, "little")   # TEXTURE
+    caps = 0x1000 | (0x400008 if mip_count > 1 else 0)  # TEXTURE (|MIPMAP|COMPLEX)
+    hdr[108:112] = caps.to_bytes(4, "little")
     hdr[112:128] = (0).to_bytes(16, "little")
     if header_type == "DX10":
-        hdr.extend(bytearray(20))
         hdr[128:132] = dxgi_fmt.to_bytes(4, "little")
         hdr[132:136] = (3).to_bytes(4, "little")    # D3D11_RESOURCE_DIMENSION_TEXTURE2D
         hdr[136:140] = (0).to_bytes(4, "little")    # misc
@@ -174,21 +254,25 @@ def texconv_to_bmp(dds_path, out_dir, debug=False):
 
 # ------------- Main Convert -------------
 def convert_one(mip_path, debug=False):
+    """Convert one _1.pct_mip to TGA. Returns (ok, reason) where reason says
+    why it failed."""
     if not mip_path.endswith("_1.pct_mip"):
         if debug: print(f"[DEBUG] Skipping {mip_path}: not a _1.pct_mip")
-        return False
+        return False, "not a _1.pct_mip"
 
-    base = os.path.basename(mip_path)
-    name = base[:-len("_1.pct_mip")]
-    res_path = os.path.join(ASSET_PCT_DIR, f"{name}.pct.resource")
-    if not os.path.isfile(res_path):
-        if debug: print(f"[DEBUG] Resource not found: {res_path}")
-        return False
+    name = os.path.basename(mip_path)[:-len("_1.pct_mip")]
+    res_path = find_resource(mip_path)
+    if res_path is None:
+        if debug: print(f"[DEBUG] Resource not found: {name}.pct.resource")
+        return False, f"resource not found: {name}.pct.resource"
 
-    os.makedirs(TGA_OUT_DIR, exist_ok=True)
+    # Everything is built in a per-job work dir and renamed into place, so a
+    # killed run never leaves a half-written .tga behind
+    work_dir = os.path.join(TGA_OUT_DIR, f"{WORK_PREFIX}{name}")
     tga_path = os.path.join(TGA_OUT_DIR, f"{name}.tga")
-    dds_path = os.path.join(TGA_OUT_DIR, f"{name}.dds")
-    bmp_path = os.path.join(TGA_OUT_DIR, f"{name}.bmp")  # used only if tga conversion fails
+    work_tga = os.path.join(work_dir, f"{name}.tga")
+    dds_path = os.path.join(work_dir, f"{name}.dds")
+    bmp_path = os.path.join(work_dir, f"{name}.bmp")  # used only if tga conversion fails
 
     res = read_resource_yaml(res_path)
     header = res.get("header", {})
@@ -205,7 +289,7 @@ def convert_one(mip_path, debug=False):
         top = max(mips, key=lambda mm: mm.get("size", 0))
     if top is None:
         if debug: print("[DEBUG] No mip levels in resource")
-        return False
+        return False, "no mip levels in resource"
 
     with open(mip_path, "rb") as f:
         f.seek(top["offset"])
@@ -217,23 +301,26 @@ def convert_one(mip_path, debug=False):
             print(f"  Mip {i+1}: offset={m['offset']}, size={m['size']}")
 
     try:
+        os.makedirs(work_dir, exist_ok=True)
         # Emissive (engine uses 37; behaves like BC4 one-channel)
         if fmt == 37:
             gray = bc4_to_img(raw, sx, sy)
             rgb = np.stack([gray, gray, gray], axis=2)
-            Image.fromarray(rgb, mode="RGB").save(tga_path)
+            Image.fromarray(rgb, mode="RGB").save(work_tga)
+            os.replace(work_tga, tga_path)
             print(f"{'[DEBUG] ' if debug else ''}Successfully converted: {tga_path}")
-            return True
+            return True, ""
 
         if fmt not in FORMAT_MAP:
             # last resort: raw RGBA try
             if len(raw) == sx * sy * 4:
                 arr = np.frombuffer(raw, dtype=np.uint8).reshape((sy, sx, 4))[:, :, :3]
-                Image.fromarray(arr, mode="RGB").save(tga_path)
+                Image.fromarray(arr, mode="RGB").save(work_tga)
+                os.replace(work_tga, tga_path)
                 print(f"{'[DEBUG] ' if debug else ''}Successfully converted: {tga_path}")
-                return True
+                return True, ""
             print(f"{'[DEBUG] ' if debug else ''}Format {fmt} not supported for {mip_path}")
-            return False
+            return False, f"format {fmt} not supported"
 
         typ, fourcc, dxgi = FORMAT_MAP[fmt]
         # Write a minimal 1-mip compressed DDS and let texconv decompress to RGBA & write image
@@ -243,74 +330,341 @@ def convert_one(mip_path, debug=False):
 
         # Try direct TGA first (force RGBA)
         ensure_texconv(debug)
-        r = texconv_to_tga(dds_path, TGA_OUT_DIR, debug=debug)
+        r = texconv_to_tga(dds_path, work_dir, debug=debug)
         if r.returncode != 0:
             # Fallback to BMP, then re-save as TGA via Pillow
             if debug: print("[DEBUG] texconv TGA failed, trying BMP route…")
-            rb = texconv_to_bmp(dds_path, TGA_OUT_DIR, debug=debug)
+            rb = texconv_to_bmp(dds_path, work_dir, debug=debug)
             if rb.returncode != 0:
                 if debug: print("[DEBUG] texconv BMP also failed")
-                return False
+                return False, f"texconv failed (tga exit {r.returncode}, bmp exit {rb.returncode})"
             # bmp should now exist; load & save as tga
             if os.path.exists(bmp_path):
                 img = Image.open(bmp_path).convert("RGB")
-                img.save(tga_path)
+                img.save(work_tga)
             else:
                 # texconv names outputs based on input; ensure path
                 # If for some reason it emitted a different name, find any .bmp and use it:
                 found = None
-                for fn in os.listdir(TGA_OUT_DIR):
+                for fn in os.listdir(work_dir):
                     if fn.lower().endswith(".bmp") and fn.lower().startswith(name.lower()):
-                        found = os.path.join(TGA_OUT_DIR, fn); break
+                        found = os.path.join(work_dir, fn); break
                 if not found:
-                    return False
-                Image.open(found).convert("RGB").save(tga_path)
-                if not debug:
-                    try: os.remove(found)
-                    except: pass
+                    return False, "texconv produced no .bmp"
+                Image.open(found).convert("RGB").save(work_tga)
+            os.replace(work_tga, tga_path)
             print(f"{'[DEBUG] ' if debug else ''}Successfully converted: {tga_path}")
         else:
-            # TexConv wrote TGA into the output dir (named <name>.tga)
-            # Nothing else needed.
+            # TexConv wrote TGA into the work dir (named <name>.tga)
+            os.replace(work_tga, tga_path)
             print(f"{'[DEBUG] ' if debug else ''}Successfully converted: {tga_path}")
 
+        return True, ""
+
+    except Exception as e:
+        if debug:
+            print("[DEBUG] Exception:", repr(e))
+        return False, repr(e)
+
+    finally:
         # Cleanup (keep intermediates if -debug)
         if debug:
             # hide intermediates in debug
-            for p in (dds_path, bmp_path):
-                if os.path.exists(p):
-                    try:
-                        os.system(f'attrib +h "{p}"')
-                    except:
-                        pass
+            try:
+                os.system(f'attrib +h "{work_dir}"')
+            except:
+                pass
         else:
-            for p in (dds_path, bmp_path):
-                if os.path.exists(p):
-                    try: os.remove(p)
-                    except: pass
+            shutil.rmtree(work_dir, ignore_errors=True)
 
-        return True
+# ------------- DDS passthrough export -------------
+def copy_range(src, dst, offset, size):
+    """Copy size bytes at offset from src to dst (open binary files)."""
+    dst.flush()
+    if hasattr(os, "sendfile"):
+        try:
+            # kernel-side copy, the payload never enters Python
+            while size > 0:
+                n = os.sendfile(dst.fileno(), src.fileno(), offset, min(size, 1 << 30))
+                if n == 0:
+                    break
+                offset += n; size -= n
+            dst.seek(0, os.SEEK_END)
+            return size
+        except OSError:
+            dst.seek(0, os.SEEK_END)
+    src.seek(offset)
+    buf = bytearray(min(COPY_CHUNK, size))
+    view = memoryview(buf)
+    while size > 0:
+        n = src.readinto(view[:min(len(buf), size)])
+        if not n:
+            break
+        dst.write(view[:n])
+        size -= n
+    return size
 
+def export_dds(mip_path, debug=False):
+    """Write the compressed mip chain straight into a .dds, no decoding.
+    Returns (ok, reason) like convert_one."""
+    if not mip_path.endswith("_1.pct_mip"):
+        if debug: print(f"[DEBUG] Skipping {mip_path}: not a _1.pct_mip")
+        return False, "not a _1.pct_mip"
+    name = os.path.basename(mip_path)[:-len("_1.pct_mip")]
+    res_path = find_resource(mip_path)
+    if res_path is None:
+        if debug: print(f"[DEBUG] Resource not found: {name}.pct.resource")
+        return False, f"resource not found: {name}.pct.resource"
+
+    header = read_resource_yaml(res_path).get("header", {})
+    fmt = header.get("format")
+    sx, sy = header.get("sx"), header.get("sy")
+    levels = mip_dims(header)
+    if fmt not in DDS_FORMAT_MAP:
+        print(f"{'[DEBUG] ' if debug else ''}Format {fmt} not supported for {mip_path}")
+        return False, f"format {fmt} not supported"
+    if not levels:
+        if debug: print("[DEBUG] No mip levels in resource")
+        return False, "no mip levels in resource"
+
+    # A DDS chain starts at sx x sy and halves each level; refuse anything
+    # else rather than write levels into the wrong slots
+    for k, (i, m, w, h) in enumerate(levels):
+        want_w, want_h = max(1, sx >> k), max(1, sy >> k)
+        want_size = expected_mip_size(fmt, w, h)
+        if (w, h) != (want_w, want_h) or m.get("size") != want_size:
+            reason = (f"mip {i} is {w}x{h} / {m.get('size')} bytes, "
+                      f"level {k} of the chain should be {want_w}x{want_h} / {want_size} bytes")
+            if debug: print(f"[DEBUG] {reason}")
+            return False, reason
+
+    typ, fourcc, dxgi = DDS_FORMAT_MAP[fmt]
+    os.makedirs(DDS_OUT_DIR, exist_ok=True)
+    dds_path = os.path.join(DDS_OUT_DIR, f"{name}.dds")
+    tmp_path = f"{dds_path}.{os.getpid()}.tmp"
+    try:
+        with open(mip_path, "rb") as src, open(tmp_path, "wb") as out:
+            out.write(make_dds_header(sx, sy, typ, fourcc, dxgi,
+                                      mip_count=len(levels), block_bytes=BLOCK_BYTES[fmt]))
+            for i, m, w, h in levels:
+                if copy_range(src, out, m["offset"], m["size"]):
+                    if debug: print(f"[DEBUG] Mip {i} ({w}x{h}) runs past end of {mip_path}")
+                    return False, f"mip {i} runs past end of file"
+        os.replace(tmp_path, dds_path)
+    finally:
+        if os.path.exists(tmp_path):
+            try: os.remove(tmp_path)
+            except: pass
+    print(f"{'[DEBUG] ' if debug else ''}Successfully exported: {dds_path} ({len(levels)} mips)")
+    return True, ""
+
+# ------------- Batch journal -------------
+# First line "#format<TAB>tga|dds" records the run's output format, then one
+# line per state change: "P<TAB>path" pending, "D<TAB>path" done,
+# "F<TAB>path<TAB>reason" failed. The last line for a path wins.
+def read_journal():
+    """(out_format, {path: state}) of the previous run."""
+    out_format, states = "tga", {}
+    if not os.path.isfile(JOURNAL_PATH):
+        return out_format, states
+    with open(JOURNAL_PATH, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.rstrip("\n").split("\t")
+            if len(parts) >= 2 and parts[0] == "#format":
+                out_format = parts[1]
+            elif len(parts) >= 2 and parts[0] in ("P", "D", "F"):
+                states[parts[1]] = parts[0]
+    return out_format, states
+
+def journal_write(journal, state, mip_path, reason=""):
+    if journal is None:
+        return
+    reason = " ".join(reason.split())  # keep it on one line
+    journal.write(f"{state}\t{mip_path}\t{reason}\n" if reason else f"{state}\t{mip_path}\n")
+    journal.flush()
+
+def clean_orphans():
+    """Remove intermediates left by a run that was killed.
+
+    Loose .dds/.bmp files in TGA_OUT_DIR (from before work dirs) only go
+    when a .tga of the same name is next to them, so nothing this tool
+    didn't make gets deleted."""
+    removed = 0
+    with os.scandir(TGA_OUT_DIR) as it:
+        entries = list(it)
+    tgas = {os.path.splitext(e.name)[0].lower() for e in entries
+            if e.is_file() and e.name.lower().endswith(".tga")}
+    for entry in entries:
+        if entry.is_dir() and entry.name.startswith(WORK_PREFIX):
+            shutil.rmtree(entry.path, ignore_errors=True)
+            removed += 1
+        elif entry.is_file() and entry.name.lower().endswith((".dds", ".bmp")) \
+                and os.path.splitext(entry.name)[0].lower() in tgas:
+            try:
+                os.remove(entry.path); removed += 1
+            except OSError:
+                pass
+    # half-written DDS exports
+    if os.path.isdir(DDS_OUT_DIR):
+        with os.scandir(DDS_OUT_DIR) as it:
+            for entry in it:
+                if entry.is_file() and ".dds." in entry.name and entry.name.endswith(".tmp"):
+                    try:
+                        os.remove(entry.path); removed += 1
+                    except OSError:
+                        pass
+    if removed:
+        print(f"Removed {removed} leftover intermediate(s)")
+
+def convert_job(mip_path, debug=False, out_format="tga"):
+    """convert_one/export_dds for batch runs: returns (ok, reason) and never raises."""
+    try:
+        run = export_dds if out_format == "dds" else convert_one
+        return run(mip_path, debug=debug)
     except Exception as e:
-        if debug:
-            print("[DEBUG] Exception:", repr(e))
-        return False
+        return False, repr(e)
+
+# ------------- Memory-aware scheduler -------------
+def estimate_peak_memory(header):
+    """Rough peak bytes a convert_one call needs, from the resource header alone."""
+    fmt = header.get("format")
+    sx, sy = header.get("sx") or 0, header.get("sy") or 0
+    mips = header.get("mipLevel") or []
+    raw = max((m.get("size", 0) for m in mips), default=0)
+    px = sx * sy
+    if fmt == 37:
+        # gray plane + stacked RGB + PIL's copy
+        decoded = px * (1 + 3 + 3)
+    elif fmt not in FORMAT_MAP:
+        # raw RGBA view + RGB slice + PIL's copy
+        decoded = px * (4 + 3 + 3)
+    else:
+        # texconv RGBA (+ its scratch) or the BMP route: RGBA load + RGB convert
+        decoded = px * (4 + 4 + 3)
+    return WORKER_OVERHEAD + 2 * raw + decoded
+
+def estimate_job(mip_path):
+    res_path = find_resource(mip_path) if mip_path.endswith("_1.pct_mip") else None
+    if res_path is None:
+        return WORKER_OVERHEAD
+    try:
+        header = (read_resource_yaml(res_path) or {}).get("header", {})
+    except Exception:
+        return WORKER_OVERHEAD
+    return estimate_peak_memory(header)
+
+def run_scheduled(files, jobs, mem_budget, debug=False, journal=None, out_format="tga"):
+    """Convert files in parallel, admitting jobs only while their estimated
+    peak memory fits in mem_budget. Largest jobs go first so the big maps
+    don't end up as the long tail.
+
+    If a worker gets killed the pool is unusable; the run stops and every
+    job that didn't finish stays pending in the journal for --resume."""
+    if out_format == "dds":
+        # passthrough never holds more than a copy chunk
+        queue = deque((WORKER_OVERHEAD, p) for p in files)
+    else:
+        queue = deque(sorted(((estimate_job(p), p) for p in files), reverse=True))
+    ok = 0
+    running = {}
+    in_use = 0
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        try:
+            while queue or running:
+                # strictly in order: if the head doesn't fit yet, wait for
+                # memory to free up instead of letting smaller jobs jump it
+                while queue and len(running) < jobs:
+                    est, p = queue[0]
+                    if running and in_use + est > mem_budget:
+                        break
+                    queue.popleft()
+                    if debug:
+                        print(f"[DEBUG] Dispatch {p} (~{est / 2**20:.0f} MiB, in use {in_use / 2**20:.0f} MiB)")
+                    running[pool.submit(convert_job, p, debug, out_format)] = (est, p)
+                    in_use += est
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    est, p = running.pop(fut)
+                    in_use -= est
+                    success, reason = fut.result()
+                    ok += success
+                    journal_write(journal, "D" if success else "F", p, reason)
+        except BrokenProcessPool:
+            print("A worker process was killed (out of memory?), stopping. "
+                  "Run again with --resume to pick up the rest.")
+    return ok
 
 def main():
     debug = False
+    resume = False
+    out_format = None  # tga unless given, or restored by --resume
+    jobs = os.cpu_count() or 1
+    mem_budget = DEFAULT_MEM_BUDGET_GB * 2**30
     files = []
-    for a in sys.argv[1:]:
+    args = iter(sys.argv[1:])
+    for a in args:
         if a == "-debug":
             debug = True
+        elif a in ("-format", "--format"):
+            out_format = next(args, "tga").lower()
+        elif a.startswith(("-format=", "--format=")):
+            out_format = a.split("=", 1)[1].lower()
+        elif a in ("-resume", "--resume"):
+            resume = True
+        elif a.startswith("-jobs="):
+            jobs = int_flag(a, "a whole number of workers, e.g. -jobs=4")
+        elif a.startswith("-mem="):
+            try:
+                mem_budget = int(float(a.split("=", 1)[1]) * 2**30)
+            except (ValueError, OverflowError):
+                mem_budget = 0
+            if mem_budget <= 0:
+                print(f"Bad {a!r}: expected a memory budget in GB, e.g. -mem=12")
+                sys.exit(1)
         else:
-            files.append(a)
-    if not files:
+            files.append(os.path.abspath(a))
+    if out_format not in (None, "tga", "dds"):
+        print(f"Unknown output format {out_format!r} (use tga or dds)")
+        sys.exit(1)
+    if not files and not resume:
         print("Drag one or more _1.pct_mip files onto this script to convert.")
         sys.exit(1)
 
     os.makedirs(TGA_OUT_DIR, exist_ok=True)
-    for p in files:
-        convert_one(p, debug=debug)
+    if not debug:
+        clean_orphans()
+
+    if resume:
+        last_format, states = read_journal()
+        if out_format is not None and out_format != last_format:
+            print(f"The previous run wrote {last_format} files, can't resume it as {out_format}. "
+                  f"Drop --format or start a new run without --resume.")
+            sys.exit(1)
+        out_format = last_format
+        # with no files given, pick up the previous run's whole list
+        files = files or list(states)
+        todo = [p for p in files if states.get(p) != "D"]
+        print(f"Resuming: {len(files) - len(todo)} already done, {len(todo)} to go")
+        files = todo
+        journal = open(JOURNAL_PATH, "a", encoding="utf-8")
+    else:
+        out_format = out_format or "tga"
+        journal = open(JOURNAL_PATH, "w", encoding="utf-8")
+        journal.write(f"#format\t{out_format}\n")
+    with journal:
+        for p in files:
+            if not resume or p not in states:
+                journal_write(journal, "P", p)
+        if not files:
+            return
+        if jobs == 1 or len(files) == 1:
+            for p in files:
+                success, reason = convert_job(p, debug=debug, out_format=out_format)
+                journal_write(journal, "D" if success else "F", p, reason)
+            return
+        if out_format == "tga":
+            ensure_texconv(debug)  # once, before workers race to download it
+        run_scheduled(files, jobs, mem_budget, debug=debug, journal=journal, out_format=out_format)
 
 if __name__ == "__main__":
     main()
@@ -2,6 +2,9 @@
 # -*- coding: utf-8 -*-
 
 from __future__ import annotations
+import os
+import re
+import struct
 import sys
 from pathlib import Path
 
@@ -254,6 +257,9 @@ SUFFIX_MAP = [
 
 IMAGE_EXTS = {".png", ".tga", ".dds", ".jpg", ".jpeg", ".exr", ".bmp", ".tiff", ".tif"}
 
+# which file wins in folder mode when e.g. rock.png and rock.tga both exist
+EXT_PRIORITY = [".tga", ".png", ".tif", ".tiff", ".exr", ".dds", ".bmp", ".jpg", ".jpeg"]
+
 BUILTINS = {
     "base": (BASE_TD, BASE_RES),
     "cc":   (BASE_TD, BASE_RES),
@@ -263,21 +269,139 @@ BUILTINS = {
     "nm":   (NM_TD, NM_RES),
 }
 
-def detect_kind(stem: str) -> str:
+def split_kind(stem: str) -> tuple[str, str]:
     s = stem.lower()
     for suffix, kind in SUFFIX_MAP:
         if s.endswith(suffix):
-            return kind
-    return "base"
+            return stem[:-len(suffix)], kind
+    return stem, "base"
+
+def detect_kind(stem: str) -> str:
+    return split_kind(stem)[1]
 
 def fill_tokens(template_text: str, image_base: str) -> str:
     return template_text.replace("(image name)", image_base)
 
+# ---------- Header-only image size sniffing ----------
+def _jpeg_size(f) -> tuple[int, int] | None:
+    f.seek(2)
+    while True:
+        b = f.read(1)
+        while b and b != b"\xff":
+            b = f.read(1)
+        while b == b"\xff":
+            b = f.read(1)
+        if not b:
+            return None
+        marker = b[0]
+        if marker in (0x01, 0xD8) or 0xD0 <= marker <= 0xD7:
+            continue
+        seg = f.read(2)
+        if len(seg) < 2:
+            return None
+        length = struct.unpack(">H", seg)[0]
+        # SOF0..SOF15 except DHT(C4), JPG(C8), DAC(CC)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            sof = f.read(5)
+            if len(sof) < 5:
+                return None
+            h, w = struct.unpack(">HH", sof[1:5])
+            return w, h
+        f.seek(length - 2, os.SEEK_CUR)
+
+def _tiff_size(f, head: bytes) -> tuple[int, int] | None:
+    e = "<" if head[:2] == b"II" else ">"
+    f.seek(struct.unpack(e + "I", head[4:8])[0])
+    raw = f.read(2)
+    if len(raw) < 2:
+        return None
+    dims = {}
+    for _ in range(struct.unpack(e + "H", raw)[0]):
+        ent = f.read(12)
+        if len(ent) < 12:
+            break
+        tag, typ = struct.unpack(e + "HH", ent[:4])
+        if tag in (256, 257):
+            fmt = e + ("H" if typ == 3 else "I")
+            dims[tag] = struct.unpack(fmt, ent[8:8 + struct.calcsize(fmt)])[0]
+    if 256 in dims and 257 in dims:
+        return dims[256], dims[257]
+    return None
+
+def _exr_size(f) -> tuple[int, int] | None:
+    f.seek(8)
+    while True:
+        name = b""
+        while (c := f.read(1)) not in (b"\0", b""):
+            name += c
+        if not name:
+            return None
+        while f.read(1) not in (b"\0", b""):
+            pass
+        size = struct.unpack("<i", f.read(4))[0]
+        if name == b"dataWindow":
+            x0, y0, x1, y1 = struct.unpack("<4i", f.read(16))
+            return x1 - x0 + 1, y1 - y0 + 1
+        f.seek(size, os.SEEK_CUR)
+
+def image_size(path: Path) -> tuple[int, int] | None:
+    """Read width/height from the file header only (no pixel decode)."""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(32)
+            if head[:8] == b"\x89PNG\r\n\x1a\n":
+                return struct.unpack(">II", head[16:24])
+            if head[:4] == b"DDS ":
+                h, w = struct.unpack("<II", head[12:20])
+                return w, h
+            if head[:2] == b"BM":
+                w, h = struct.unpack("<ii", head[18:26])
+                return w, abs(h)
+            if head[:2] == b"\xff\xd8":
+                return _jpeg_size(f)
+            if head[:4] in (b"II*\0", b"MM\0*"):
+                return _tiff_size(f, head)
+            if head[:4] == b"\x76\x2f\x31\x01":
+                return _exr_size(f)
+            if path.suffix.lower() == ".tga" and len(head) >= 18:
+                return struct.unpack("<HH", head[12:16])
+    except (OSError, struct.error):
+        return None
+    return None
+
+def mip_count(size: tuple[int, int]) -> int:
+    # log2 of the longest side, matching the stock templates (12 for 4096)
+    return max(1, max(size).bit_length() - 1)
+
+def set_mipmap_level(td_text: str, levels: int) -> str:
+    return re.sub(r"mipmap_level = \d+", f"mipmap_level = {levels}", td_text, count=1)
+
+BASE_SIBLING_LINKS = (
+    "- res://pct/(image name)_nm.pct.resource\n"
+    "- res://pct/(image name)_spec.pct.resource\n"
+)
+
+def set_sibling_links(res_text: str, kinds: set[str]) -> str:
+    links = "".join(
+        f"- res://pct/(image name){suffix}.pct.resource\n"
+        for suffix, kind in SUFFIX_MAP if kind in kinds
+    )
+    return res_text.replace(BASE_SIBLING_LINKS, links)
+
 def write_text(path: Path, text: str, overwrite: bool) -> None:
-    if path.exists() and not overwrite:
-        print(f"Skip (exists): {path}")
-        return
-    path.write_text(text, encoding="utf-8", newline="\n")
+    data = text.encode("utf-8")
+    if path.exists():
+        # byte-identical files are left alone so their mtime doesn't change
+        try:
+            if path.stat().st_size == len(data) and path.read_bytes() == data:
+                print(f"Unchanged: {path}")
+                return
+        except OSError:
+            pass
+        if not overwrite:
+            print(f"Skip (exists): {path}")
+            return
+    path.write_bytes(data)
     print(f"Created: {path}")
 
 def process_image(img: Path, overwrite: bool) -> None:
@@ -297,6 +421,44 @@ def process_image(img: Path, overwrite: bool) -> None:
     write_text(out_td, td_text, overwrite)
     write_text(out_res, res_text, overwrite)
 
+def process_dir(folder: Path, overwrite: bool) -> None:
+    stack = [folder]
+    while stack:
+        d = stack.pop()
+        images: dict[str, Path] = {}
+        with os.scandir(d) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(Path(entry.path))
+                elif entry.is_file() and os.path.splitext(entry.name)[1].lower() in IMAGE_EXTS:
+                    stem = os.path.splitext(entry.name)[0]
+                    found = Path(entry.path)
+                    other = images.get(stem)
+                    if other is not None:
+                        keep, drop = sorted((other, found), key=lambda q: EXT_PRIORITY.index(q.suffix.lower()))
+                        print(f"Duplicate: {stem} (using {keep.name}, ignoring {drop.name})")
+                        found = keep
+                    images[stem] = found
+        # group _nm/_spec/... maps under their base name in one pass
+        siblings: dict[str, set[str]] = {}
+        for stem in images:
+            base, kind = split_kind(stem)
+            siblings.setdefault(base.lower(), set()).add(kind)
+        for stem in sorted(images):
+            img = images[stem]
+            try:
+                base, kind = split_kind(stem)
+                td_tmpl, res_tmpl = BUILTINS[kind]
+                size = image_size(img)
+                if size is not None and min(size) > 0:
+                    td_tmpl = set_mipmap_level(td_tmpl, mip_count(size))
+                if kind == "base":
+                    res_tmpl = set_sibling_links(res_tmpl, siblings.get(base.lower(), set()))
+                write_text(img.with_name(f"{stem}.td"), fill_tokens(td_tmpl, stem), overwrite)
+                write_text(img.with_name(f"{stem}.td.resource"), fill_tokens(res_tmpl, stem), overwrite)
+            except Exception as e:
+                print(f"[ERROR] {img}: {e}")
+
 def main(argv: list[str]) -> int:
     if not argv:
         return 1
@@ -311,7 +473,10 @@ def main(argv: list[str]) -> int:
         return 1
     for p in paths:
         try:
-            process_image(Path(p), overwrite)
+            if Path(p).is_dir():
+                process_dir(Path(p), overwrite)
+            else:
+                process_image(Path(p), overwrite)
         except Exception as e:
             print(f"[ERROR] {p}: {e}")
     return 0